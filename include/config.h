@@ -31,6 +31,9 @@ namespace Config
     // --- Reranking Hyperparameters ---
     constexpr size_t MAX_RERANK_CANDIDATES = 2048;
     constexpr int64_t MAX_SEQ_LEN = 512;
+    // Batches are trimmed to their longest pair, so the load-time warmup runs at a
+    // typical trimmed length (the exporter's default trace length) rather than 512
+    constexpr int64_t RERANK_WARMUP_SEQ_LEN = 128;
     constexpr size_t DOCUMENT_TRUNCATE_WORDS = 256;
     constexpr size_t DEFAULT_RERANK_BATCH_SIZE = 128;
     constexpr size_t GPU_CHUNK_SIZE = 256;
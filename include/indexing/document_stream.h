@@ -12,15 +12,21 @@ namespace fs = std::filesystem;
 /**
  * Lightweight metadata for a document stored on disk
  * Avoids loading content until needed
+ *
+ * For a sharded corpus, filepath names the shard file and the document
+ * occupies [offset, offset + file_size) within it.
  */
 struct DocumentMetadata
 {
     unsigned int id;
     std::string filepath;
     size_t file_size;
+    size_t offset;
+    int shard; // -1 for one-file-per-document corpora
 
-    DocumentMetadata(unsigned int id, const std::string &path, size_t size)
-        : id(id), filepath(path), file_size(size) {}
+    DocumentMetadata(unsigned int id, const std::string &path, size_t size,
+                     size_t offset = 0, int shard = -1)
+        : id(id), filepath(path), file_size(size), offset(offset), shard(shard) {}
 };
 
 /**
@@ -85,9 +91,15 @@ private:
 class DocumentStream
 {
 public:
+    // Present in a corpus directory written with download_dataset.py --layout sharded
+    static constexpr const char *SHARD_INDEX_FILENAME = "index.tsv";
+
     /**
      * Initialize stream from a corpus directory
      * Only loads metadata, not content
+     *
+     * If the directory contains an index.tsv, the corpus is read from the
+     * shard files it references; otherwise every .txt file is one document.
      */
     DocumentStream(const std::string &corpus_dir);
 
@@ -147,10 +159,18 @@ private:
     std::unordered_map<unsigned int, std::string> id_to_doc_name_;
     std::string corpus_dir_;
 
+    // Shard files stay mapped for the lifetime of the stream (sharded layout only)
+    std::vector<MemoryMappedFile> shards_;
+
     /**
      * Scan corpus directory and build metadata index
      */
     void build_metadata_index(const std::string &corpus_dir);
+
+    /**
+     * Build metadata index from a sharded corpus's index.tsv
+     */
+    void build_sharded_metadata_index(const std::string &corpus_dir);
 };
 
 #endif 
\ No newline at end of file
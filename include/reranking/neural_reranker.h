@@ -8,6 +8,7 @@
 #include <vector>
 #include <string>
 #include <memory>
+#include <mutex>
 
 struct ScoredDocument
 {
@@ -40,8 +41,14 @@ private:
     size_t batch_size_;
     const int64_t max_seq_len_ = Config::MAX_SEQ_LEN;
 
+    // Persistent buffers sized for a full batch, allocated once in the constructor.
+    // rerank_batch() is called concurrently (one cilk_for strand per query), so
+    // buffer_mutex_ is held from filling the [batch, seq] input prefix until the
+    // logits have been read back out of scores_cpu_
+    std::mutex buffer_mutex_;
     torch::Tensor input_ids_gpu_;
     torch::Tensor attention_mask_gpu_;
+    torch::Tensor scores_cpu_; // pinned host memory for the [batch, 1] logits
 };
 
 #endif // NEURAL_RERANKER_H
\ No newline at end of file
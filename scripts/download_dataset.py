@@ -1,18 +1,242 @@
+import argparse
 import ir_datasets
+import itertools
 import os
-import re
+import queue
+import threading
+import zlib
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from tqdm import tqdm
 
-def sanitize_filename(doc_id):
+# Documents handed to each worker process per task
+BATCH_SIZE = 10000
+
+# Progress advances a whole batch at a time: show the overall average rate
+# (smoothing=0) and cap repaints at two per second
+PROGRESS_OPTIONS = {"mininterval": 0.5, "smoothing": 0}
+
+# Sharded layout: documents are packed into SHARD_COUNT shard files and located
+# through an index of (doc_id, shard, offset, length) records
+SHARD_COUNT = 256
+SHARD_INDEX_FILENAME = "index.tsv"
+# Rough per-document size used to preallocate shard files (title + abstract)
+ESTIMATED_DOC_BYTES = 2048
+
+def format_doc_text(title, abstract):
+    """
+    Combines title and abstract into the document text, handling None values.
+    Documents with only one of the two fields skip the concatenation.
+    """
+    if not abstract:
+        return (title or "").strip()
+    if not title:
+        return abstract.strip()
+    return f"{title} {abstract}".strip()
+
+def write_doc_batch(docs, corpus_output_dir):
+    """
+    Writes a batch of (doc_id, title, abstract) tuples, one file per document.
+    Runs in a worker process; returns the saved and skipped document counts.
+    Files are created relative to a directory fd with raw os.open/os.write,
+    bypassing Python's file object stack and repeated path resolution.
+    """
+    saved_docs = 0
+    skipped_docs = 0
+
+    dir_fd = os.open(corpus_output_dir, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        for doc_id, title, abstract in docs:
+            full_text = format_doc_text(title, abstract)
+
+            # Skip documents with no content
+            if not full_text:
+                skipped_docs += 1
+                continue
+
+            # Use original doc_id as filename. CORD-19 cord_uids are 8 lowercase
+            # alphanumerics, so no sanitization is needed, and the qrels must
+            # reference the exact same ID the file is named after.
+            try:
+                fd = os.open(f"{doc_id}.txt", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666,
+                             dir_fd=dir_fd)
+                try:
+                    data = memoryview(full_text.encode("utf-8"))
+                    while data:
+                        data = data[os.write(fd, data):]
+                finally:
+                    os.close(fd)
+                saved_docs += 1
+
+            except Exception as e:
+                print(f"\n  Error writing document {doc_id}: {e}")
+                skipped_docs += 1
+    finally:
+        os.close(dir_fd)
+
+    return saved_docs, skipped_docs
+
+def write_corpus_files(dataset, corpus_output_dir):
+    """
+    Writes one file per document using a pool of worker processes.
+    Returns the saved and skipped document counts.
+    """
+    total_docs_processed = 0
+    skipped_docs = 0
+
+    # The main process only pulls plain tuples off the iterator; formatting and
+    # writing happen in the workers. In-flight batches are bounded so the
+    # corpus is never fully materialized in memory.
+    max_workers = os.cpu_count() or 1
+    doc_iterator = dataset.docs_iter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor, \
+            tqdm(total=dataset.docs_count(), desc="Downloading documents", **PROGRESS_OPTIONS) as pbar:
+        pending = set()
+        while True:
+            # Documents with neither field are skipped here, before anything
+            # is formatted or shipped to a worker. The slice is consumed
+            # directly; only the picklable tuple batch is materialized.
+            batch = []
+            batch_docs = 0
+            for doc in itertools.islice(doc_iterator, BATCH_SIZE):
+                batch_docs += 1
+                if doc.title or doc.abstract:
+                    batch.append((doc.doc_id, doc.title, doc.abstract))
+            skipped_docs += batch_docs - len(batch)
+            pbar.update(batch_docs - len(batch))
+            if batch:
+                pending.add(executor.submit(write_doc_batch, batch, corpus_output_dir))
+
+            # Keep at most two batches per worker in flight; drain everything at the end
+            if batch_docs and len(pending) < 2 * max_workers:
+                continue
+            if not pending:
+                break
+
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                batch_saved, batch_skipped = future.result()
+                total_docs_processed += batch_saved
+                skipped_docs += batch_skipped
+                pbar.update(batch_saved + batch_skipped)
+
+    return total_docs_processed, skipped_docs
+
+def preallocate(f, size):
+    """
+    Reserves size bytes for an open file so the filesystem can lay it out in
+    few extents. Best effort: silently skipped where unsupported.
+    """
+    if size <= 0 or not hasattr(os, "posix_fallocate"):
+        return
+    try:
+        os.posix_fallocate(f.fileno(), 0, size)
+    except OSError:
+        pass
+
+def write_shard_batches(batch_queue, shard_files, f_index, errors):
+    """
+    Writer thread for write_corpus_shards: appends queued (doc_id, shard, record)
+    batches to the shard files until a None sentinel arrives, then writes the index.
+    A repeated doc_id keeps only its last record, just as the files layout
+    overwrites <doc_id>.txt, so both layouts yield the same corpus.
+    """
+    shard_offsets = [0] * len(shard_files)
+    index_entries = {}
+    while (batch := batch_queue.get()) is not None:
+        if errors:
+            # Keep draining so the producer never blocks on a full queue
+            continue
+        try:
+            for doc_id, shard, record in batch:
+                shard_files[shard].write(record)
+                index_entries[doc_id] = (shard, shard_offsets[shard], len(record))
+                shard_offsets[shard] += len(record)
+        except Exception as e:
+            errors.append(e)
+
+    if not errors:
+        try:
+            f_index.writelines(f"{doc_id}\t{shard}\t{offset}\t{length}\n"
+                               for doc_id, (shard, offset, length) in index_entries.items())
+        except Exception as e:
+            errors.append(e)
+
+def write_corpus_shards(dataset, corpus_output_dir):
     """
-    Sanitize document ID to create a valid filename.
-    Replaces any non-alphanumeric characters with underscores.
+    Packs all documents into SHARD_COUNT shard files plus a tab-separated index
+    of (doc_id, shard, offset, length) records, avoiding ~190k tiny files.
+    Dataset iteration and formatting overlap with disk writes on a background thread.
+    Returns the saved and skipped document counts.
     """
-    return re.sub(r'[^a-zA-Z0-9_-]', '_', doc_id)
+    total_docs_processed = 0
+    skipped_docs = 0
+    shard_prefix = os.path.join(corpus_output_dir, "shard_")
+    shard_files = [
+        open(f"{shard_prefix}{shard:02x}.dat", "wb", buffering=1 << 16)
+        for shard in range(SHARD_COUNT)
+    ]
+    index_path = os.path.join(corpus_output_dir, SHARD_INDEX_FILENAME)
+
+    estimated_shard_bytes = dataset.docs_count() * ESTIMATED_DOC_BYTES // SHARD_COUNT
+    for f_shard in shard_files:
+        preallocate(f_shard, estimated_shard_bytes)
 
-def download_and_format_trec_covid():
+    # Bounded so at most a few batches are held in memory ahead of the writer
+    batch_queue = queue.Queue(maxsize=4)
+    errors = []
+
+    try:
+        with open(index_path, "w", encoding="utf-8", buffering=1 << 20) as f_index:
+            writer = threading.Thread(target=write_shard_batches,
+                                      args=(batch_queue, shard_files, f_index, errors))
+            writer.start()
+            try:
+                doc_iterator = dataset.docs_iter()
+                with tqdm(total=dataset.docs_count(), desc="Downloading documents",
+                          **PROGRESS_OPTIONS) as pbar:
+                    while True:
+                        batch = []
+                        batch_docs = 0
+                        for doc in itertools.islice(doc_iterator, BATCH_SIZE):
+                            batch_docs += 1
+                            # Skip documents with no content, checking the raw
+                            # fields before building any strings
+                            if not (doc.title or doc.abstract):
+                                skipped_docs += 1
+                                continue
+
+                            full_text = format_doc_text(doc.title, doc.abstract)
+                            if not full_text:
+                                skipped_docs += 1
+                                continue
+
+                            # crc32 rather than hash() so the layout is stable across runs
+                            shard = zlib.crc32(doc.doc_id.encode("utf-8")) % SHARD_COUNT
+                            batch.append((doc.doc_id, shard, full_text.encode("utf-8")))
+
+                        if not batch_docs:
+                            break
+                        batch_queue.put(batch)
+                        total_docs_processed += len(batch)
+                        pbar.update(batch_docs)
+            finally:
+                batch_queue.put(None)
+                writer.join()
+    finally:
+        for f_shard in shard_files:
+            # Drop the unused part of the preallocation
+            f_shard.truncate(f_shard.tell())
+            f_shard.close()
+
+    if errors:
+        raise errors[0]
+
+    return total_docs_processed, skipped_docs
+
+def download_and_format_trec_covid(layout="files"):
     """
-    Downloads the TREC-COVID dataset and saves each document as an individual file.
+    Downloads the TREC-COVID dataset and saves each document as an individual file,
+    or packs the corpus into shard files when layout is "sharded".
     Creates a qrels file that ONLY references documents that were successfully downloaded.
     """
     dataset_id = "cord19/trec-covid"
@@ -24,48 +248,33 @@ def download_and_format_trec_covid():
     topics_path = os.path.join(base_output_dir, f"topics.{sanitized_dataset_name}.txt")
     qrels_path = os.path.join(base_output_dir, f"qrels.{sanitized_dataset_name}.txt")
 
-    # Ensure output directories exist
+    # Ensure output directories exist (this also creates base_output_dir)
     print(f"Creating output directory: {corpus_output_dir}")
     os.makedirs(corpus_output_dir, exist_ok=True)
-    os.makedirs(base_output_dir, exist_ok=True)
 
     # Load the dataset
     print(f"Loading ir_datasets '{dataset_id}'...")
     dataset = ir_datasets.load(dataset_id)
     print("Dataset loaded successfully.")
 
-    # Step 1: Download and save documents, tracking which ones we actually saved
+    # Step 1: Download and save documents
     print(f"\nProcessing {dataset.docs_count()} documents...")
-    total_docs_processed = 0
-    skipped_docs = 0
-    saved_doc_ids = set()  # Track successfully saved document IDs
-
-    for doc in tqdm(dataset.docs_iter(), total=dataset.docs_count(), desc="Downloading documents"):
-        # Use original doc_id as filename (CORD-19 IDs are already clean)
-        doc_id = doc.doc_id
-        filename = f"{doc_id}.txt"
-        filepath = os.path.join(corpus_output_dir, filename)
-        
-        # Combine title and abstract, handling None values
-        title = doc.title or ""
-        abstract = doc.abstract or ""
-        full_text = f"{title} {abstract}".strip()
-        
-        # Skip documents with no content
-        if not full_text:
-            skipped_docs += 1
-            continue
-        
-        # Write the document content to its own file
+    if layout == "sharded":
+        total_docs_processed, skipped_docs = write_corpus_shards(dataset, corpus_output_dir)
+        # Track saved document IDs from the shard index that was just written
+        with open(os.path.join(corpus_output_dir, SHARD_INDEX_FILENAME), encoding="utf-8") as f_index:
+            saved_doc_ids = {line.split('\t', 1)[0] for line in f_index}
+    else:
+        # A leftover shard index would take precedence over the per-document files
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
-                f.write(full_text)
-            total_docs_processed += 1
-            saved_doc_ids.add(doc_id)  # Track that we saved this document
-            
-        except Exception as e:
-            print(f"\n  Error writing document {doc.doc_id}: {e}")
-            skipped_docs += 1
+            os.remove(os.path.join(corpus_output_dir, SHARD_INDEX_FILENAME))
+        except FileNotFoundError:
+            pass
+        total_docs_processed, skipped_docs = write_corpus_files(dataset, corpus_output_dir)
+        # Track saved document IDs with a single directory read rather than a
+        # per-document set insert; this reflects exactly what the indexer will see
+        with os.scandir(corpus_output_dir) as entries:
+            saved_doc_ids = {entry.name[:-4] for entry in entries if entry.name.endswith('.txt')}
 
     print(f"\nCorpus download complete:")
     print(f"  Total documents saved: {total_docs_processed}")
@@ -74,34 +283,36 @@ def download_and_format_trec_covid():
 
     # Step 2: Process and save the topics (queries)
     print(f"\nProcessing {dataset.queries_count()} topics...")
-    with open(topics_path, "w", encoding="utf-8") as f_topics:
-        for query in dataset.queries_iter():
-            f_topics.write("<top>\n")
-            f_topics.write(f"<num>Number: {query.query_id}</num>\n")
-            f_topics.write(f"<title>{query.title}</title>\n")
-            f_topics.write("</top>\n")
+    topics_text = "".join(
+        f"<top>\n<num>Number: {query.query_id}</num>\n<title>{query.title}</title>\n</top>\n"
+        for query in dataset.queries_iter()
+    )
+    # One encode and one write for the whole file
+    with open(topics_path, "wb") as f_topics:
+        f_topics.write(topics_text.encode("utf-8"))
     print(f"Topics saved to '{topics_path}'")
 
     # Step 3: Process qrels and FILTER to only include documents we actually saved
     print(f"\nProcessing and filtering {dataset.qrels_count()} qrels...")
     qrels_total = 0
-    qrels_saved = 0
-    qrels_skipped = 0
+    qrel_lines = []
     queries_with_relevant = set()
-    
-    with open(qrels_path, "w", encoding="utf-8") as f_qrels:
-        for qrel in dataset.qrels_iter():
-            qrels_total += 1
-            
-            # Only include qrels for documents that exist in our corpus
-            if qrel.doc_id in saved_doc_ids:
-                f_qrels.write(f"{qrel.query_id} 0 {qrel.doc_id} {qrel.relevance}\n")
-                qrels_saved += 1
-                if qrel.relevance > 0:
-                    queries_with_relevant.add(qrel.query_id)
-            else:
-                qrels_skipped += 1
-    
+
+    for qrel in dataset.qrels_iter():
+        qrels_total += 1
+
+        # Only include qrels for documents that exist in our corpus
+        if qrel.doc_id in saved_doc_ids:
+            qrel_lines.append(f"{qrel.query_id} 0 {qrel.doc_id} {qrel.relevance}\n")
+            if qrel.relevance > 0:
+                queries_with_relevant.add(qrel.query_id)
+
+    # The filtered qrels are a few MB at most: build them in memory and write once
+    with open(qrels_path, "wb") as f_qrels:
+        f_qrels.write("".join(qrel_lines).encode("utf-8"))
+    qrels_saved = len(qrel_lines)
+    qrels_skipped = qrels_total - qrels_saved
+
     print(f"Qrels processing complete:")
     print(f"  Total qrels from dataset: {qrels_total}")
     print(f"  Qrels saved (docs exist): {qrels_saved}")
@@ -114,32 +325,39 @@ def download_and_format_trec_covid():
     print("VERIFICATION")
     print("="*80)
     
-    # Count actual files in corpus
-    actual_files = len([f for f in os.listdir(corpus_output_dir) if f.endswith('.txt')])
-    print(f"Documents in corpus directory: {actual_files}")
-    print(f"Documents tracked in saved_doc_ids: {len(saved_doc_ids)}")
+    # saved_doc_ids was built from what the indexer will read: the shard index
+    # or the corpus directory listing
+    corpus_source = "shard index" if layout == "sharded" else "corpus directory"
+    print(f"Documents in {corpus_source}: {len(saved_doc_ids)}")
+    print(f"Documents written this run: {total_docs_processed}")
     
-    # Verify qrels references valid docs
+    # Verify qrels references valid docs, streaming the file without
+    # materializing its doc IDs into a second set
     print(f"\nVerifying qrels file...")
-    with open(qrels_path, 'r') as f:
-        qrels_relevant_count = 0
-        qrels_doc_ids = set()
+    qrels_judgment_count = 0
+    qrels_relevant_count = 0
+    missing_count = 0
+    missing_sample = []
+    with open(qrels_path, 'r', encoding="utf-8") as f:
         for line in f:
-            parts = line.strip().split()
+            parts = line.split()
             if len(parts) == 4:
-                query_id, _, doc_id, relevance = parts
-                qrels_doc_ids.add(doc_id)
+                _, _, doc_id, relevance = parts
+                qrels_judgment_count += 1
+                if doc_id not in saved_doc_ids:
+                    missing_count += 1
+                    if len(missing_sample) < 5:
+                        missing_sample.append(doc_id)
                 if int(relevance) > 0:
                     qrels_relevant_count += 1
-    
-    print(f"Unique doc IDs in qrels: {len(qrels_doc_ids)}")
+
+    print(f"Judgments in qrels: {qrels_judgment_count}")
     print(f"Relevant judgments in qrels: {qrels_relevant_count}")
-    
+
     # Check for any mismatches
-    mismatches = qrels_doc_ids - saved_doc_ids
-    if mismatches:
-        print(f"\nWARNING: {len(mismatches)} doc IDs in qrels not in corpus!")
-        print(f"  This should not happen. Sample: {list(mismatches)[:5]}")
+    if missing_count:
+        print(f"\nWARNING: {missing_count} qrels reference doc IDs not in corpus!")
+        print(f"  This should not happen. Sample: {missing_sample}")
     else:
         print(f"\nSUCCESS: All qrels reference documents that exist in corpus!")
 
@@ -155,4 +373,9 @@ def download_and_format_trec_covid():
     print("="*80)
 
 if __name__ == "__main__":
-    download_and_format_trec_covid()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Download TREC-COVID and format it for the indexer.')
+    parser.add_argument('--layout', choices=['files', 'sharded'], default='files',
+                        help='Corpus layout: one file per document, or shard files plus an index (default: files)')
+    args = parser.parse_args()
+
+    download_and_format_trec_covid(layout=args.layout)
\ No newline at end of file
@@ -0,0 +1,562 @@
+import pandas as pd
+import matplotlib
+# Headless batch rendering: select Agg before anything imports pyplot
+matplotlib.use('Agg')
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.colors import to_rgba
+from matplotlib.figure import Figure
+from matplotlib.layout_engine import TightLayoutEngine
+import seaborn as sns
+import numpy as np
+from pathlib import Path
+from functools import lru_cache
+import argparse
+import csv
+import hashlib
+import io
+import os
+import sys
+
+DEFAULT_CSV_PATH = "results/all_benchmarks.csv"
+DEFAULT_PLOTS_DIR = "results/plots"
+# --- 1. ADDED: Path to the new indexing results CSV ---
+INDEXING_CSV_PATH = "results/indexing_benchmarks.csv"
+# 150 dpi is plenty for reports and rasterizes 4x fewer pixels than 300
+DEFAULT_DPI = 150
+# Rows per chunk when --summary-only streams the results CSV
+SUMMARY_CHUNK_ROWS = 100_000
+# Written next to the plots; holds the fingerprint of the inputs that produced them
+INPUTS_STAMP_FILENAME = ".inputs_stamp"
+
+# Explicit schema for both benchmark CSVs so the parser skips type inference;
+# float32 is plenty of precision for plotting and the 2-decimal report
+BENCHMARK_DTYPES = {
+    'num_cpu_workers': 'int16', 'use_reranking': 'bool',
+    'query_processing_time_ms': 'float32', 'throughput_qps': 'float32',
+    'precision_at_10': 'float32', 'map': 'float32', 'mrr': 'float32',
+    'ndcg_at_10': 'float32', 'avg_retrieval_ms': 'float32', 'avg_reranking_ms': 'float32',
+    'median_latency_ms': 'float32', 'p95_latency_ms': 'float32',
+    'indexing_time_ms': 'float32', 'throughput_docs_per_sec': 'float32',
+}
+
+# Retrieval modes drawn side by side within each metric group of the effectiveness chart
+MODE_LABELS = ['Boolean', 'Reranking']
+MODE_POSITIONS = np.arange(len(MODE_LABELS))
+# Pre-parsed to RGBA so matplotlib does not re-parse the hex strings per artist
+MODE_COLORS = [to_rgba('#3498db'), to_rgba('#e74c3c')]
+# x positions of the Precision@10 / MAP / nDCG@10 groups
+METRIC_POSITIONS = np.arange(3)
+
+# The only columns the plots and report ever read; everything else is skipped at parse time
+QUERY_COLUMNS = ['label', 'num_cpu_workers', 'use_reranking', 'throughput_qps',
+                 'median_latency_ms', 'p95_latency_ms', 'precision_at_10', 'map', 'ndcg_at_10']
+INDEXING_COLUMNS = ['num_cpu_workers', 'indexing_time_ms', 'throughput_docs_per_sec']
+
+@lru_cache(maxsize=1)
+def _configure_style():
+    """Set a professional style for the plots, once per process."""
+    sns.set_style("whitegrid")
+    matplotlib.rcParams.update({
+        'figure.figsize': (10, 6), 'font.size': 12, 'axes.labelsize': 14,
+        'axes.titlesize': 16, 'legend.fontsize': 12, 'xtick.labelsize': 12,
+        'ytick.labelsize': 12, 'figure.dpi': 150, 'lines.markersize': 8,
+        # Cheaper Agg path rendering: merge near-collinear segments and
+        # rasterize long paths in chunks
+        'path.simplify': True, 'path.simplify_threshold': 1.0, 'agg.path.chunksize': 10000
+    })
+
+def new_figure(figsize, rect=(0, 0, 1, 1)):
+    """
+    Create a standalone figure on an Agg canvas, bypassing pyplot. The tight
+    layout engine is attached up front and applied when the figure is drawn.
+    """
+    fig = Figure(figsize=figsize, layout=TightLayoutEngine(rect=rect))
+    FigureCanvasAgg(fig)
+    return fig
+
+def save_figure(fig, filename, dpi):
+    """
+    Encode a figure in memory, then atomically replace the target file,
+    so an interrupted run never leaves a truncated image behind.
+    """
+    fmt = filename.suffix[1:]
+    # PNG is lossless at any zlib level; level 1 encodes far faster for a few % more bytes
+    save_kwargs = {'pil_kwargs': {'compress_level': 1}} if fmt == 'png' else {}
+    buf = io.BytesIO()
+    fig.savefig(buf, format=fmt, dpi=dpi, **save_kwargs)
+    tmp_file = filename.with_name(filename.name + ".tmp")
+    tmp_file.write_bytes(buf.getbuffer())
+    os.replace(tmp_file, filename)
+
+def inputs_fingerprint(paths, options):
+    """Hash the contents of the input files (missing ones count as empty) and the output options."""
+    digest = hashlib.blake2b(digest_size=16)
+    for path in paths:
+        path = Path(path)
+        digest.update(path.read_bytes() if path.exists() else b"")
+        digest.update(b"\0")
+    digest.update(repr(options).encode())
+    return digest.hexdigest()
+
+def file_digest(path):
+    """Hash of one output file's contents."""
+    return hashlib.blake2b(Path(path).read_bytes(), digest_size=16).hexdigest()
+
+def write_stamp(stamp_file, fingerprint, outputs):
+    """Record the input fingerprint plus a digest of every output it produced."""
+    lines = [fingerprint] + [f"{file_digest(path)}  {Path(path).name}" for path in outputs]
+    stamp_file.write_text("\n".join(lines) + "\n")
+
+def stamp_is_current(stamp_file, fingerprint):
+    """
+    True when the stamp was written for the same fingerprint and every output
+    it lists still exists, unmodified, next to it.
+    """
+    if not stamp_file.exists():
+        return False
+    lines = stamp_file.read_text().splitlines()
+    if len(lines) < 2 or lines[0] != fingerprint:
+        return False
+    for entry in lines[1:]:
+        digest, _, name = entry.partition("  ")
+        path = stamp_file.parent / name
+        if not path.is_file() or file_digest(path) != digest:
+            return False
+    return True
+
+def read_benchmark_csv(csv_file, columns, chunksize=None):
+    """
+    Read the wanted columns of a benchmark CSV, with the multithreaded Arrow
+    parser when pyarrow is installed. Wanted columns missing from the file are
+    simply left out. With a chunksize, returns an iterator of frames instead.
+    """
+    with open(csv_file, newline='') as f:
+        header = next(csv.reader(f), [])
+    if not header:
+        raise pd.errors.EmptyDataError(f"No columns to parse from {csv_file}")
+    usecols = [col for col in header if col in columns]
+
+    # The Arrow engine cannot stream, so chunked reads go through the C parser
+    if chunksize:
+        return pd.read_csv(csv_file, usecols=usecols, dtype=BENCHMARK_DTYPES, chunksize=chunksize)
+    try:
+        return pd.read_csv(csv_file, engine='pyarrow', usecols=usecols, dtype=BENCHMARK_DTYPES)
+    except ImportError:
+        return pd.read_csv(csv_file, usecols=usecols, dtype=BENCHMARK_DTYPES)
+
+def infer_reranking(df):
+    """Infer 'use_reranking' from the label for easier filtering if not present."""
+    if 'use_reranking' not in df.columns:
+        # The benchmark suite appends '_Rerank' to the label, so a literal
+        # suffix check is enough; no regex needed
+        df['use_reranking'] = df['label'].str.endswith('_Rerank')
+    return df
+
+def average_runs_in_chunks(csv_file, chunksize):
+    """
+    Average duplicate runs while streaming the CSV, folding per-chunk sums and
+    counts per configuration so only one chunk is ever held in memory.
+    """
+    group_cols = ['label', 'num_cpu_workers', 'use_reranking']
+    partials = [
+        infer_reranking(chunk).groupby(group_cols, observed=True, sort=False).agg(['sum', 'count'])
+        for chunk in read_benchmark_csv(csv_file, QUERY_COLUMNS, chunksize=chunksize)
+    ]
+    totals = pd.concat(partials).groupby(level=group_cols, observed=True, sort=False).sum()
+    means = totals.xs('sum', axis=1, level=1) / totals.xs('count', axis=1, level=1)
+    return means.reset_index()
+
+def load_data(csv_file, chunksize=None):
+    """
+    Load and preprocess benchmark results from the CSV file.
+    A chunksize streams the file instead of parsing it in one piece.
+    """
+    if not Path(csv_file).exists():
+        print(f"Error: Results file not found at {csv_file}")
+        return pd.DataFrame()
+    try:
+        group_cols = ['label', 'num_cpu_workers', 'use_reranking']
+        if chunksize:
+            df = average_runs_in_chunks(csv_file, chunksize)
+        else:
+            df = infer_reranking(read_benchmark_csv(csv_file, QUERY_COLUMNS))
+
+            # Handle potential duplicate runs by averaging results for the same configuration;
+            # a single hash pass finds whether there are any before paying for the groupby
+            if df.duplicated(subset=group_cols).any():
+                df = df.groupby(group_cols, as_index=False, observed=True,
+                                sort=False).mean(numeric_only=True)
+
+        # Compact dtypes for the columns every plot filters on: a real bool flag
+        # instead of 0/1 ints, and Arrow-backed (or categorical) labels
+        df['use_reranking'] = df['use_reranking'].astype(bool)
+        try:
+            df['label'] = df['label'].astype('string[pyarrow]')
+        except ImportError:
+            df['label'] = df['label'].astype('category')
+            
+        print(f"Loaded {len(df)} benchmark results from {csv_file}")
+        print(f"Columns: {df.columns.tolist()}")
+        print(f"Available worker counts: {sorted(df['num_cpu_workers'].unique())}")
+        return df
+    except pd.errors.EmptyDataError:
+        print(f"Warning: Results file {csv_file} is empty.")
+        return pd.DataFrame()
+    except Exception as e:
+        print(f"Error loading data: {e}")
+        return pd.DataFrame()
+
+# --- 2. ADDED: New function to plot indexing scalability ---
+def plot_indexing_scalability(output_dir, dpi=DEFAULT_DPI, fmt='png'):
+    """Loads indexing data and plots scalability. Returns the paths written."""
+    _configure_style()
+    output_dir = Path(output_dir)
+    indexing_csv = Path(INDEXING_CSV_PATH)
+    if not indexing_csv.exists():
+        print(f"\nWarning: Indexing benchmark file not found at {INDEXING_CSV_PATH}")
+        print("         Run 'make benchmark-indexing' to generate it.")
+        return []
+
+    try:
+        df = read_benchmark_csv(indexing_csv, INDEXING_COLUMNS)
+    except pd.errors.EmptyDataError:
+        print(f"Warning: Indexing benchmark file {INDEXING_CSV_PATH} is empty.")
+        return []
+    
+    if df.empty or 'num_cpu_workers' not in df.columns:
+        print("Skipping indexing plots: No data or 'num_cpu_workers' column missing.")
+        return []
+
+    print(f"\nLoaded {len(df)} indexing benchmark results.")
+    df = df.sort_values('num_cpu_workers')
+
+    # Pull the columns out as plain arrays once; both plots share them
+    workers = df['num_cpu_workers'].to_numpy()
+    worker_ticks = np.unique(workers)
+    
+    # Plot 1: Indexing Throughput
+    fig = new_figure((10, 6))
+    ax = fig.subplots()
+    ax.plot(workers, df['throughput_docs_per_sec'].to_numpy(), 
+            marker='D', linestyle='-', label='Indexing Throughput')
+    ax.set_xlabel('Number of CPU Workers (from C++ loop)')
+    ax.set_ylabel('Throughput (Documents/Second)')
+    ax.set_title('Indexing Throughput vs. CPU Workers')
+    ax.set_xticks(worker_ticks)
+    ax.legend()
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+    filename_throughput = output_dir / f"scalability_indexing_throughput.{fmt}"
+    save_figure(fig, filename_throughput, dpi)
+    print(f"✓ Saved indexing throughput plot: {filename_throughput}")
+
+    # Plot 2: Indexing Time
+    fig = new_figure((10, 6))
+    ax = fig.subplots()
+    ax.plot(workers, df['indexing_time_ms'].to_numpy(), 
+            marker='D', linestyle='--', color='darkred', label='Indexing Time')
+    ax.set_xlabel('Number of CPU Workers (from C++ loop)')
+    ax.set_ylabel('Total Time (ms)')
+    ax.set_title('Indexing Time vs. CPU Workers')
+    ax.set_xticks(worker_ticks)
+    ax.legend()
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+    filename_time = output_dir / f"scalability_indexing_time.{fmt}"
+    save_figure(fig, filename_time, dpi)
+    print(f"✓ Saved indexing time plot: {filename_time}")
+    return [filename_throughput, filename_time]
+
+def split_by_reranking(df):
+    """Split results into Boolean and Reranking frames, each sorted by CPU workers."""
+    groups = {bool(rerank): group.sort_values('num_cpu_workers')
+              for rerank, group in df.groupby('use_reranking', observed=True)}
+    empty = df.iloc[:0]
+    return groups.get(False, empty), groups.get(True, empty)
+
+def plot_scalability(boolean_df, rerank_df, output_dir, metric, title, ylabel, log_scale=False,
+                     dpi=DEFAULT_DPI, fmt='png', worker_ticks=None):
+    """
+    Generic function to plot scalability of a given metric vs. CPU workers.
+    Callers drawing several metrics can pass the sorted worker_ticks once.
+    Returns the paths written (none when the plot is skipped).
+    """
+    _configure_style()
+    output_dir = Path(output_dir)
+    if ((boolean_df.empty and rerank_df.empty) or metric not in boolean_df.columns
+            or 'num_cpu_workers' not in boolean_df.columns):
+        print(f"Skipping plot '{title}': Missing required data columns.")
+        return []
+
+    fig = new_figure((10, 6))
+    ax = fig.subplots()
+    
+    # Plot Boolean Retrieval performance
+    if not boolean_df.empty:
+        ax.plot(boolean_df['num_cpu_workers'].to_numpy(), boolean_df[metric].to_numpy(), 
+                marker='s', linestyle='-', label='Boolean Retrieval')
+
+    # Plot Reranking (End-to-End) performance
+    if not rerank_df.empty:
+        ax.plot(rerank_df['num_cpu_workers'].to_numpy(), rerank_df[metric].to_numpy(), 
+                marker='o', linestyle='--', label='End-to-End Reranking')
+
+    ax.set_xlabel('Number of CPU Workers (CILK_NWORKERS)')
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    
+    if worker_ticks is None:
+        worker_ticks = np.union1d(boolean_df['num_cpu_workers'], rerank_df['num_cpu_workers'])
+    if worker_ticks.size:
+        ax.set_xticks(worker_ticks)
+        
+    if log_scale:
+        ax.set_yscale('log')
+        ax.set_ylabel(f"{ylabel} (Log Scale)")
+
+    ax.legend()
+    ax.grid(True, which='both', linestyle='--', linewidth=0.5)
+    
+    filename = output_dir / f"scalability_{metric}.{fmt}"
+    save_figure(fig, filename, dpi)
+    print(f"✓ Saved scalability plot: {filename}")
+    return [filename]
+
+def plot_effectiveness_comparison(boolean_df, rerank_df, output_dir, max_cpu,
+                                  dpi=DEFAULT_DPI, fmt='png'):
+    """Plot a side-by-side comparison of effectiveness metrics at max CPU workers. Returns the paths written."""
+    _configure_style()
+    output_dir = Path(output_dir)
+    if boolean_df.empty and rerank_df.empty:
+        print("Skipping effectiveness bar plot: DataFrame is empty.")
+        return []
+
+    # Use a representative configuration (e.g., max CPU workers) for comparison
+    if pd.isna(max_cpu):
+        print("Skipping effectiveness bar plot: No CPU worker data found.")
+        return []
+        
+    # Each partition only needs its own max-worker rows averaged
+    metrics = ['precision_at_10', 'map', 'ndcg_at_10']
+    boolean_metrics = boolean_df.loc[boolean_df['num_cpu_workers'] == max_cpu, metrics]
+    rerank_metrics = rerank_df.loc[rerank_df['num_cpu_workers'] == max_cpu, metrics]
+
+    if boolean_metrics.empty or rerank_metrics.empty:
+        print(f"Skipping effectiveness bar plot: missing data for {max_cpu} workers.")
+        return []
+        
+    scores = np.vstack([boolean_metrics.mean().to_numpy(), rerank_metrics.mean().to_numpy()])
+    titles = ['Precision@10', 'MAP', 'nDCG@10']
+
+    # One grouped chart: a group per metric, one bar per retrieval mode
+    fig = new_figure((12, 6))
+    ax = fig.subplots()
+    width = 0.35
+    offsets = (MODE_POSITIONS - MODE_POSITIONS.mean()) * width
+    for values, offset, label, color in zip(scores, offsets, MODE_LABELS, MODE_COLORS):
+        bars = ax.bar(METRIC_POSITIONS + offset, values, width, label=label,
+                      color=color, alpha=0.85, edgecolor='black')
+        ax.bar_label(bars, fmt='%.4f', fontweight='bold', fontsize=11)
+
+    ax.set_xticks(METRIC_POSITIONS)
+    ax.set_xticklabels(titles)
+    ax.set_ylabel('Score')
+    ax.set_title(f'Effectiveness Comparison: Boolean vs. Reranking (at {max_cpu} CPU workers)')
+    top = scores.max()
+    ax.set_ylim(0, top * 1.25 if top > 0 else 1)
+    ax.legend(fontsize=12)
+    filename = output_dir / f"effectiveness_comparison_bars.{fmt}"
+    save_figure(fig, filename, dpi)
+    print(f"✓ Saved effectiveness bar plot: {filename}")
+    return [filename]
+
+def generate_summary_report(boolean_df, rerank_df, output_dir):
+    """Generate a clean text summary report of the benchmark results; returns its path, if written."""
+    output_dir = Path(output_dir)
+    if boolean_df.empty and rerank_df.empty:
+        print("Skipping summary report: DataFrame is empty.")
+        return None
+        
+    report_file = output_dir / "benchmark_summary.txt"
+
+    # to_string() never truncates rows or wraps columns, so only the number
+    # format needs passing; no global display options are touched
+    float_format = '{:,.2f}'.format
+
+    # Assemble the whole report in memory; it is written to disk in one go
+    with io.StringIO() as f:
+        f.write("=" * 120 + "\n")
+        f.write("BENCHMARK SUMMARY REPORT\n")
+        f.write("=" * 120 + "\n\n")
+
+        if not boolean_df.empty:
+            f.write("--- [ TABLE 1: Pure Boolean Retrieval Performance ] ---\n\n")
+            summary_cols = ['num_cpu_workers', 'throughput_qps', 'median_latency_ms', 'p95_latency_ms', 'precision_at_10', 'map', 'ndcg_at_10']
+            f.write(boolean_df[summary_cols].to_string(index=False, float_format=float_format))
+            f.write("\n\n")
+        else:
+            f.write("--- No data for Pure Boolean Retrieval ---\n\n")
+
+        if not rerank_df.empty:
+            f.write("--- [ TABLE 2: End-to-End Reranking Performance ] ---\n\n")
+            summary_cols = ['num_cpu_workers', 'throughput_qps', 'median_latency_ms', 'p95_latency_ms', 'precision_at_10', 'map', 'ndcg_at_10']
+            f.write(rerank_df[summary_cols].to_string(index=False, float_format=float_format))
+            f.write("\n\n")
+        else:
+            f.write("--- No data for End-to-End Reranking ---\n\n")
+
+        if not boolean_df.empty and not rerank_df.empty:
+            f.write("--- [ TABLE 3: Reranking vs. Boolean (% Change) ] ---\n\n")
+            
+            # Compared metrics and the report column each one produces
+            change_cols = {
+                'throughput_qps': 'throughput_%_change',
+                'median_latency_ms': 'latency_%_change',
+                'precision_at_10': 'p10_%_change',
+                'map': 'map_%_change',
+                'ndcg_at_10': 'ndcg10_%_change',
+            }
+            metric_cols = list(change_cols)
+
+            # Align data on worker count, carrying only the compared metrics
+            merged_df = pd.merge(
+                boolean_df[['num_cpu_workers'] + metric_cols], 
+                rerank_df[['num_cpu_workers'] + metric_cols], 
+                on='num_cpu_workers', 
+                suffixes=('_bool', '_rerank'),
+                how='inner'
+            )
+            
+            if not merged_df.empty:
+                # Calculate % change for all metrics in one block operation
+                old = merged_df[[f"{col}_bool" for col in metric_cols]].to_numpy()
+                new = merged_df[[f"{col}_rerank" for col in metric_cols]].to_numpy()
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    pct_change = (new - old) / old * 100
+                comparison_df = pd.DataFrame(pct_change, columns=list(change_cols.values()))
+                comparison_df.insert(0, 'num_cpu_workers', merged_df['num_cpu_workers'].to_numpy())
+                
+                f.write(comparison_df.to_string(index=False, float_format=float_format))
+                f.write("\n\n")
+            else:
+                f.write("--- No matching worker counts found for comparison ---\n\n")
+
+        f.write("=" * 120 + "\n")
+        f.write("Report generation complete.\n")
+        f.write("=" * 120 + "\n")
+        report = f.getvalue()
+
+    report_file.write_text(report)
+    print(f"✓ Saved summary report: {report_file}")
+    
+    # Print the report to console as well
+    print(report)
+    return report_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate IR benchmark visualizations from a consolidated CSV file.')
+    parser.add_argument('--results', required=False, default=DEFAULT_CSV_PATH,
+                        help=f'Path to the consolidated results CSV file (default: {DEFAULT_CSV_PATH})')
+    parser.add_argument('--output-dir', default=DEFAULT_PLOTS_DIR, 
+                        help=f'Directory to save plots and reports (default: {DEFAULT_PLOTS_DIR})')
+    parser.add_argument('--dpi', type=int, default=DEFAULT_DPI,
+                        help=f'Resolution of the PNG plots (default: {DEFAULT_DPI})')
+    parser.add_argument('--format', choices=['png', 'svg', 'pdf'], default='png',
+                        help='Output format of the plots; svg and pdf are vector formats '
+                             'that skip rasterization entirely (default: png)')
+    parser.add_argument('--summary-only', action='store_true',
+                        help='Only write the text summary, streaming the results CSV in chunks')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate everything even if the inputs are unchanged since the last run')
+    args = parser.parse_args()
+    
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    print("\n" + "=" * 80)
+    print("BENCHMARK VISUALIZATION SUITE")
+    print("=" * 80 + "\n")
+
+    if args.summary_only:
+        df = load_data(args.results, chunksize=SUMMARY_CHUNK_ROWS)
+        if not df.empty:
+            generate_summary_report(*split_by_reranking(df), output_dir)
+        return
+    
+    # Skip the rendering when neither the CSVs, this script nor the output
+    # options changed since the last successful run and its outputs are intact
+    stamp_file = output_dir / INPUTS_STAMP_FILENAME
+    fingerprint = inputs_fingerprint([args.results, INDEXING_CSV_PATH, __file__],
+                                     (str(Path(args.results).resolve()), args.dpi, args.format))
+    if not args.force and stamp_is_current(stamp_file, fingerprint):
+        print(f"Inputs unchanged since the last run; outputs in {output_dir} are up to date.")
+        print("Pass --force to regenerate them anyway.\n")
+        report_file = output_dir / "benchmark_summary.txt"
+        if report_file.exists():
+            print(report_file.read_text())
+        return
+
+    df = load_data(args.results)
+
+    # Paths of everything written, recorded in the stamp
+    outputs = []
+
+    if not df.empty:
+        print("\n--- Generating Query Performance Plots ---")
+        # Partition once; every plot and the report share the sorted frames
+        boolean_df, rerank_df = split_by_reranking(df)
+        worker_ticks = np.unique(df['num_cpu_workers'].to_numpy())
+        max_cpu = worker_ticks[-1]
+        plot_options = {'dpi': args.dpi, 'fmt': args.format}
+
+        # Generate the core scalability plots
+        outputs += plot_scalability(boolean_df, rerank_df, output_dir, 'throughput_qps', 
+                                    'System Throughput vs. CPU Workers', 
+                                    'Throughput (Queries/Second)', log_scale=True,
+                                    worker_ticks=worker_ticks, **plot_options)
+                         
+        outputs += plot_scalability(boolean_df, rerank_df, output_dir, 'median_latency_ms', 
+                                    'Median Query Latency vs. CPU Workers', 
+                                    'Median Latency (ms)', log_scale=True,
+                                    worker_ticks=worker_ticks, **plot_options)
+                         
+        # Generate effectiveness scalability plots
+        outputs += plot_scalability(boolean_df, rerank_df, output_dir, 'precision_at_10', 
+                                    'Precision@10 vs. CPU Workers', 
+                                    'Precision@10 Score', worker_ticks=worker_ticks, **plot_options)
+                         
+        outputs += plot_scalability(boolean_df, rerank_df, output_dir, 'map', 
+                                    'MAP vs. CPU Workers', 
+                                    'MAP Score', worker_ticks=worker_ticks, **plot_options)
+                         
+        outputs += plot_scalability(boolean_df, rerank_df, output_dir, 'ndcg_at_10', 
+                                    'nDCG@10 vs. CPU Workers', 
+                                    'nDCG@10 Score', worker_ticks=worker_ticks, **plot_options)
+        
+        # Generate the summary bar chart
+        outputs += plot_effectiveness_comparison(boolean_df, rerank_df, output_dir, max_cpu,
+                                                 **plot_options)
+        
+        # Generate the detailed text summary
+        report_file = generate_summary_report(boolean_df, rerank_df, output_dir)
+        if report_file is not None:
+            outputs.append(report_file)
+    else:
+        print("Could not generate query plots due to missing or empty data file.")
+        # Do not exit, we might still have indexing data
+    
+    print("\n--- Generating Indexing Performance Plots ---")
+    outputs += plot_indexing_scalability(output_dir, dpi=args.dpi, fmt=args.format)
+
+    write_stamp(stamp_file, fingerprint, outputs)
+
+    print("\n" + "=" * 80)
+    print("All visualizations completed!")
+    print(f"Results saved to: {output_dir}")
+    print("=" * 80 + "\n")
+    # else: # Removed this 'else' block
+    #     print("Could not generate plots due to missing or empty data file.")
+    #     sys.exit(1)
+
+if __name__ == "__main__":
+    main()
+
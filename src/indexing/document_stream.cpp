@@ -9,6 +9,7 @@
 #include <fcntl.h>
 #include <unistd.h>
 #include <cstring>
+#include <cstdio>
 #include <algorithm>
 
 MemoryMappedFile::MemoryMappedFile()
@@ -135,6 +136,12 @@ void DocumentStream::build_metadata_index(const std::string &corpus_dir)
         throw std::runtime_error("Corpus directory does not exist: " + corpus_dir);
     }
 
+    if (fs::exists(fs::path(corpus_dir) / SHARD_INDEX_FILENAME))
+    {
+        build_sharded_metadata_index(corpus_dir);
+        return;
+    }
+
     unsigned int doc_id = 0;
     size_t total_size = 0;
 
@@ -184,6 +191,94 @@ void DocumentStream::build_metadata_index(const std::string &corpus_dir)
               << " bytes" << std::endl;
 }
 
+void DocumentStream::build_sharded_metadata_index(const std::string &corpus_dir)
+{
+    const fs::path index_path = fs::path(corpus_dir) / SHARD_INDEX_FILENAME;
+    std::ifstream ifs(index_path);
+    if (!ifs)
+    {
+        throw std::runtime_error("Could not open shard index: " + index_path.string());
+    }
+
+    struct ShardEntry
+    {
+        std::string name;
+        int shard;
+        size_t offset;
+        size_t length;
+    };
+
+    std::vector<ShardEntry> entries;
+    int max_shard = -1;
+    std::string line;
+    while (std::getline(ifs, line))
+    {
+        std::stringstream ss(line);
+        ShardEntry entry;
+        if (ss >> entry.name >> entry.shard >> entry.offset >> entry.length && entry.shard >= 0)
+        {
+            max_shard = std::max(max_shard, entry.shard);
+            entries.push_back(std::move(entry));
+        }
+        else
+        {
+            std::cerr << "Warning: Skipping malformed shard index line: " << line << std::endl;
+        }
+    }
+
+    // Same ordering as the per-file layout, so document IDs do not depend on the layout
+    std::sort(entries.begin(), entries.end(),
+              [](const ShardEntry &a, const ShardEntry &b)
+              { return a.name < b.name; });
+
+    std::vector<std::string> shard_paths(max_shard + 1);
+    shards_.resize(max_shard + 1);
+    for (int shard = 0; shard <= max_shard; ++shard)
+    {
+        char filename[32];
+        std::snprintf(filename, sizeof(filename), "shard_%02x.dat", shard);
+        shard_paths[shard] = (fs::path(corpus_dir) / filename).string();
+        if (!shards_[shard].open(shard_paths[shard]))
+        {
+            throw std::runtime_error("Failed to map shard file: " + shard_paths[shard]);
+        }
+    }
+
+    unsigned int doc_id = 0;
+    size_t total_size = 0;
+
+    for (const auto &entry : entries)
+    {
+        if (entry.length == 0)
+        {
+            continue;
+        }
+        if (entry.offset + entry.length > shards_[entry.shard].size())
+        {
+            throw std::runtime_error("Shard index entry out of range for document: " + entry.name);
+        }
+
+        metadata_.emplace_back(doc_id, shard_paths[entry.shard], entry.length, entry.offset, entry.shard);
+        doc_name_to_id_[entry.name] = doc_id;
+        id_to_doc_name_[doc_id] = entry.name;
+
+        total_size += entry.length;
+        doc_id++;
+
+        if (doc_id % 10000 == 0)
+        {
+            std::cout << "  Indexed " << doc_id << " documents..." << std::endl;
+        }
+    }
+
+    std::cout << "Document stream index built (" << shards_.size() << " shards):" << std::endl;
+    std::cout << "  Total documents: " << metadata_.size() << std::endl;
+    std::cout << "  Total corpus size: " << (total_size / (1024.0 * 1024.0))
+              << " MB" << std::endl;
+    std::cout << "  Average document size: " << (total_size / metadata_.size())
+              << " bytes" << std::endl;
+}
+
 std::string DocumentStream::read_document(unsigned int doc_id) const
 {
     if (doc_id >= metadata_.size())
@@ -193,15 +288,23 @@ std::string DocumentStream::read_document(unsigned int doc_id) const
 
     const auto &meta = metadata_[doc_id];
 
-    MemoryMappedFile mmap_file;
-    if (!mmap_file.open(meta.filepath))
+    std::string content;
+    if (meta.shard >= 0)
     {
-        std::cerr << "Warning: Failed to read document " << doc_id
-                  << " from " << meta.filepath << std::endl;
-        return "";
+        // Shards are mapped once up front; copy this document's slice
+        content.assign(shards_[meta.shard].data() + meta.offset, meta.file_size);
+    }
+    else
+    {
+        MemoryMappedFile mmap_file;
+        if (!mmap_file.open(meta.filepath))
+        {
+            std::cerr << "Warning: Failed to read document " << doc_id
+                      << " from " << meta.filepath << std::endl;
+            return "";
+        }
+        content = mmap_file.read_all();
     }
-
-    std::string content = mmap_file.read_all();
 
     QueryPreprocessor preprocessor;
     content = preprocessor.preprocess(content);
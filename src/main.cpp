@@ -24,6 +24,15 @@ void print_separator(char ch = '=', int width = 80)
     std::cout << std::string(width, ch) << std::endl;
 }
 
+// Where a document can be found on disk: its own .txt file, or, for a sharded
+// corpus, the shard index that locates it by name
+std::string document_location(const std::string &doc_name, bool sharded_corpus)
+{
+    if (sharded_corpus)
+        return doc_name + " (see ./" + Config::CORPUS_DIR + "/" + DocumentStream::SHARD_INDEX_FILENAME + ")";
+    return "./" + Config::CORPUS_DIR + "/" + doc_name + ".txt";
+}
+
 int main(int argc, char **argv)
 {
     print_separator();
@@ -188,6 +197,7 @@ int main(int argc, char **argv)
         HighPerformanceIRSystem system(Config::INDEX_PATH, Config::SYNONYM_PATH, num_shards);
         GpuNeuralReranker gpu_reranker(Config::MODEL_PATH.c_str(), Config::VOCAB_PATH.c_str(), Config::BATCH_SIZE);
         DocumentStore doc_store(Config::INDEX_PATH);
+        const bool sharded_corpus = fs::exists(fs::path(Config::CORPUS_DIR) / DocumentStream::SHARD_INDEX_FILENAME);
 
         std::string query;
         while (true)
@@ -210,7 +220,7 @@ int main(int argc, char **argv)
                 const std::string *doc_name = doc_store.get_document_name(candidates[i].doc_id);
                 if (doc_name)
                 {
-                    std::cout << "  " << (i + 1) << ". Document: " << "./" << Config::CORPUS_DIR << "/" << *doc_name << ".txt"
+                    std::cout << "  " << (i + 1) << ". Document: " << document_location(*doc_name, sharded_corpus)
                               << " (ID: " << candidates[i].doc_id << ")" << std::endl;
                 }
                 else
@@ -250,7 +260,7 @@ int main(int argc, char **argv)
                 const std::string *doc_name = doc_store.get_document_name(reranked[i].id);
                 if (doc_name)
                 {
-                    std::cout << "  " << (i + 1) << ". Document: " << "./" << Config::CORPUS_DIR << "/" << *doc_name << ".txt"
+                    std::cout << "  " << (i + 1) << ". Document: " << document_location(*doc_name, sharded_corpus)
                               << " (ID: " << reranked[i].id
                               << ", Score: " << std::fixed << std::setprecision(4)
                               << reranked[i].score << ")" << std::endl;
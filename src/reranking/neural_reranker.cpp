@@ -29,6 +29,22 @@ GpuNeuralReranker::GpuNeuralReranker(
     auto tensor_options = torch::TensorOptions().dtype(torch::kLong).device(device_);
     input_ids_gpu_ = torch::zeros({(long)batch_size_, max_seq_len_}, tensor_options);
     attention_mask_gpu_ = torch::zeros({(long)batch_size_, max_seq_len_}, tensor_options);
+    scores_cpu_ = torch::empty({(long)batch_size_, 1}, torch::TensorOptions().dtype(torch::kFloat).pinned_memory(true));
+
+    // TorchScript's profiling executor only specializes and fuses the graph
+    // after it has seen a couple of runs; pay for those here instead of in the
+    // first timed queries, on the kind of trimmed shape rerank_batch() produces
+    {
+        torch::NoGradGuard no_grad;
+        const int64_t warmup_len = std::min(Config::RERANK_WARMUP_SEQ_LEN, max_seq_len_);
+        const int64_t warmup_elems = (long)batch_size_ * warmup_len;
+        auto warmup_ids = input_ids_gpu_.view(-1).narrow(0, 0, warmup_elems).view({(long)batch_size_, warmup_len});
+        auto warmup_mask = attention_mask_gpu_.view(-1).narrow(0, 0, warmup_elems).view({(long)batch_size_, warmup_len});
+        warmup_mask.fill_(1);
+        std::vector<torch::jit::IValue> warmup_inputs{warmup_ids, warmup_mask};
+        for (int run = 0; run < 2; ++run)
+            module_.forward(warmup_inputs);
+    }
 
     std::cout << "GPU cross-encoder loaded via LibTorch (batch=" << batch_size_
               << ", max_seq_len=" << max_seq_len_ << ")" << std::endl;
@@ -49,24 +65,34 @@ std::vector<ScoredDocument> GpuNeuralReranker::rerank_batch(
     std::vector<int64_t> all_attention_masks;
     all_input_ids.reserve(current_batch_size * max_seq_len_);
     all_attention_masks.reserve(current_batch_size * max_seq_len_);
+    int64_t longest_seq = 1;
 
     for (const auto &doc : batch_docs)
     {
         std::vector<int64_t> input_ids_vec;
         std::vector<int64_t> attention_mask_vec;
         tokenizer_->encode_pair(query, doc.content, max_seq_len_, input_ids_vec, attention_mask_vec);
+        longest_seq = std::max<int64_t>(longest_seq, std::count(attention_mask_vec.begin(), attention_mask_vec.end(), 1));
         all_input_ids.insert(all_input_ids.end(), input_ids_vec.begin(), input_ids_vec.end());
         all_attention_masks.insert(all_attention_masks.end(), attention_mask_vec.begin(), attention_mask_vec.end());
     }
 
-    // 1. Create temporary CPU tensors that POINT to the vector data (no copy)
+    // 1. Create temporary CPU tensors that POINT to the vector data (no copy).
+    // Columns past the longest sequence in the batch are masked padding for
+    // every row, so they are dropped: attention cost grows with seq_len^2
     auto cpu_options = torch::TensorOptions().dtype(torch::kLong);
-    torch::Tensor input_ids_cpu = torch::from_blob(all_input_ids.data(), {(long)current_batch_size, max_seq_len_}, cpu_options);
-    torch::Tensor attention_mask_cpu = torch::from_blob(all_attention_masks.data(), {(long)current_batch_size, max_seq_len_}, cpu_options);
+    torch::Tensor input_ids_cpu = torch::from_blob(all_input_ids.data(), {(long)current_batch_size, max_seq_len_}, cpu_options)
+                                      .slice(1, 0, longest_seq);
+    torch::Tensor attention_mask_cpu = torch::from_blob(all_attention_masks.data(), {(long)current_batch_size, max_seq_len_}, cpu_options)
+                                           .slice(1, 0, longest_seq);
+
+    // The shared buffers below are reused by every caller; tokenization above stays parallel
+    std::lock_guard<std::mutex> lock(buffer_mutex_);
 
-    // 2. Use a slice of the pre-allocated GPU tensor for the current batch size
-    auto input_ids_view = input_ids_gpu_.slice(0, 0, current_batch_size);
-    auto attention_mask_view = attention_mask_gpu_.slice(0, 0, current_batch_size);
+    // 2. View the front of the pre-allocated GPU buffers as a contiguous [batch, longest_seq] tensor
+    const int64_t batch_elems = (long)current_batch_size * longest_seq;
+    auto input_ids_view = input_ids_gpu_.view(-1).narrow(0, 0, batch_elems).view({(long)current_batch_size, longest_seq});
+    auto attention_mask_view = attention_mask_gpu_.view(-1).narrow(0, 0, batch_elems).view({(long)current_batch_size, longest_seq});
 
     // 3. Perform an efficient copy from the CPU tensor to the GPU tensor's view
     input_ids_view.copy_(input_ids_cpu);
@@ -79,9 +105,10 @@ std::vector<ScoredDocument> GpuNeuralReranker::rerank_batch(
 
     at::Tensor output_tensor = module_.forward(inputs).toTensor();
 
-    // ... rest of the function remains the same ...
-    output_tensor = output_tensor.to(torch::kCPU);
-    auto output_accessor = output_tensor.accessor<float, 2>();
+    // 4. Copy the logits into the pinned host buffer rather than allocating a CPU tensor per batch
+    auto scores_view = scores_cpu_.slice(0, 0, current_batch_size);
+    scores_view.copy_(output_tensor);
+    auto output_accessor = scores_view.accessor<float, 2>();
 
     std::vector<ScoredDocument> results;
     results.reserve(current_batch_size);